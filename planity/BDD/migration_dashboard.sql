@@ -0,0 +1,9 @@
+-- Versions des sections du tableau de bord (GET /api/prothesiste/bootstrap) : chaque table lue
+-- porte updated_at, comparé avec le nombre de lignes avant de recharger une section
+ALTER TABLE services
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+ALTER TABLE prothesiste_services
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+-- Table répartie : à exécuter aussi sur chaque shard
+ALTER TABLE prothesiste_unavailable
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
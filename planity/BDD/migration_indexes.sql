@@ -0,0 +1,8 @@
+-- Index ajoutés suite à l'audit des plans d'exécution (audit_queries.py sur benchmarks/bench_archive.py
+-- et bench_batch_booking.py), nommés selon la convention de table.sql
+-- GET /api/appointments trie toute la table par date puis heure
+CREATE INDEX idx_appointments_date_time ON appointments(appointment_date, appointment_time);
+
+-- idx_prothesiste_date (prothesiste_id, appointment_date) est un préfixe de
+-- idx_appointments_prothesiste_date, qui sert déjà les mêmes requêtes et la clé étrangère
+DROP INDEX idx_prothesiste_date ON appointments;
@@ -0,0 +1,3 @@
+-- Sessions révocables (déconnexion) : date de révocation et index du rafraîchissement incrémental
+ALTER TABLE user_sessions ADD COLUMN revoked_at DATETIME NULL AFTER expires_at;
+CREATE INDEX idx_user_sessions_revoked ON user_sessions(revoked_at);
@@ -0,0 +1,6 @@
+-- Attribution explicite des prothésistes aux shards (prothesistes.shard)
+ALTER TABLE prothesistes ADD COLUMN shard VARCHAR(20) NULL AFTER verification_token;
+
+-- Les prothésistes existantes gardent shard NULL : leurs rendez-vous, disponibilités et avis
+-- restent dans la base principale, toujours lue par l'application. Seules les nouvelles
+-- inscriptions sont réparties sur les shards.
@@ -175,7 +175,8 @@ CREATE TABLE prothesistes (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     is_active BOOLEAN DEFAULT TRUE,
     is_verified BOOLEAN DEFAULT FALSE,
-    verification_token VARCHAR(100)
+    verification_token VARCHAR(100),
+    shard VARCHAR(20) -- bind hébergeant ses rendez-vous (shard_0, shard_1...), NULL : base principale
 );
 
 -- Table des disponibilités des prothésistes
@@ -202,6 +203,7 @@ CREATE TABLE prothesiste_unavailable (
     reason VARCHAR(200),
     is_full_day BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (prothesiste_id) REFERENCES prothesistes(id) ON DELETE CASCADE,
     INDEX idx_prothesiste_date (prothesiste_id, date)
 );
@@ -217,6 +219,7 @@ CREATE TABLE services (
     price DECIMAL(6,2) NOT NULL,
     category VARCHAR(50) DEFAULT 'manicure',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     is_active BOOLEAN DEFAULT TRUE
 );
 
@@ -229,6 +232,7 @@ CREATE TABLE prothesiste_services (
     custom_duration INT, -- durée personnalisée
     is_available BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (prothesiste_id) REFERENCES prothesistes(id) ON DELETE CASCADE,
     FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE CASCADE,
     UNIQUE KEY unique_prothesiste_service (prothesiste_id, service_id)
@@ -240,10 +244,12 @@ CREATE TABLE clients (
     user_id INT UNIQUE,
     name VARCHAR(100) NOT NULL,
     phone VARCHAR(20) NOT NULL,
+    phone_normalized VARCHAR(16), -- format E.164 (+33XXXXXXXXX)
     email VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
+    UNIQUE KEY unique_client_phone (phone_normalized)
 );
 
 -- Table des rendez-vous (mise à jour)
@@ -266,10 +272,42 @@ CREATE TABLE appointments (
     FOREIGN KEY (prothesiste_id) REFERENCES prothesistes(id) ON DELETE CASCADE,
     FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE CASCADE,
     INDEX idx_appointment_date (appointment_date),
-    INDEX idx_prothesiste_date (prothesiste_id, appointment_date),
     INDEX idx_user_appointments (user_id)
 );
 
+-- Archive des rendez-vous anciens (mêmes colonnes, id d'origine conservé)
+-- Alimentée par backend/archive_appointments.py
+CREATE TABLE appointments_archive (
+    id INT PRIMARY KEY,
+    user_id INT,
+    client_id INT,
+    prothesiste_id INT NOT NULL,
+    service_id INT NOT NULL,
+    appointment_date DATE NOT NULL,
+    appointment_time TIME NOT NULL,
+    duration INT DEFAULT 60,
+    price DECIMAL(6,2),
+    status ENUM('pending', 'confirmed', 'cancelled', 'completed', 'no_show') DEFAULT 'confirmed',
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
+    FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE SET NULL,
+    FOREIGN KEY (prothesiste_id) REFERENCES prothesistes(id) ON DELETE CASCADE,
+    FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE CASCADE,
+    INDEX idx_archive_date (appointment_date),
+    INDEX idx_archive_prothesiste_date (prothesiste_id, appointment_date),
+    INDEX idx_archive_user (user_id)
+);
+
+-- Avancement des imports en masse (backend/import_salons.py)
+CREATE TABLE import_checkpoints (
+    source VARCHAR(255) PRIMARY KEY, -- type d'import et fichier source
+    rows_done BIGINT NOT NULL DEFAULT 0,
+    rows_rejected BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
 -- Table des sessions utilisateur (pour la gestion des tokens)
 CREATE TABLE user_sessions (
     id INT PRIMARY KEY AUTO_INCREMENT,
@@ -278,6 +316,7 @@ CREATE TABLE user_sessions (
     session_token VARCHAR(255) UNIQUE NOT NULL,
     user_type ENUM('user', 'prothesiste') NOT NULL,
     expires_at DATETIME NOT NULL,
+    revoked_at DATETIME NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (prothesiste_id) REFERENCES prothesistes(id) ON DELETE CASCADE,
@@ -300,6 +339,20 @@ CREATE TABLE reviews (
     UNIQUE KEY unique_appointment_review (appointment_id)
 );
 
+-- Table des clés d'idempotence (rejeu des réponses POST)
+CREATE TABLE idempotency_keys (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    scope VARCHAR(50) NOT NULL, -- endpoint concerné
+    idempotency_key VARCHAR(255) NOT NULL,
+    request_hash CHAR(64) NOT NULL, -- sha256 de l'appelant (Authorization) et du corps
+    status_code SMALLINT, -- NULL tant que la requête est en cours
+    response_body MEDIUMTEXT,
+    expires_at DATETIME NOT NULL, -- bail court tant que la requête est en cours, puis durée de rejeu
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_scope_key (scope, idempotency_key),
+    INDEX idx_idempotency_expires (expires_at)
+);
+
 -- Vues utiles
 CREATE VIEW appointments_detailed AS
 SELECT 
@@ -349,7 +402,9 @@ GROUP BY p.id;
 
 -- Index pour optimiser les performances
 CREATE INDEX idx_appointments_prothesiste_date ON appointments(prothesiste_id, appointment_date, appointment_time);
+CREATE INDEX idx_appointments_date_time ON appointments(appointment_date, appointment_time);
 CREATE INDEX idx_user_sessions_token ON user_sessions(session_token);
 CREATE INDEX idx_user_sessions_expires ON user_sessions(expires_at);
+CREATE INDEX idx_user_sessions_revoked ON user_sessions(revoked_at);
 CREATE INDEX idx_prothesiste_availability ON prothesiste_availability(prothesiste_id, day_of_week);
 CREATE INDEX idx_reviews_prothesiste ON reviews(prothesiste_id, rating);
\ No newline at end of file
@@ -0,0 +1,126 @@
+# analytics.py - Statistiques de chiffre d'affaires et d'activité calculées par colonnes
+#
+# Les rendez-vous ne sont pas chargés comme objets ORM : seules les colonnes utiles sont lues,
+# par lots, et converties en tableaux NumPy. Chaque lot est agrégé de façon vectorisée
+# (np.bincount) puis additionné aux lots précédents : la mémoire reste bornée par la taille
+# d'un lot, quel que soit le volume de la période.
+from datetime import date
+from typing import Dict, Iterator, List
+import numpy as np
+from sqlalchemy import String, extract, select, type_coerce
+
+STATUSES = ('pending', 'confirmed', 'cancelled', 'completed', 'no_show')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+CANCELLED = STATUS_CODES['cancelled']
+NO_SHOW = STATUS_CODES['no_show']
+# Rendez-vous comptés dans le chiffre d'affaires
+REVENUE_CODES = [STATUS_CODES['confirmed'], STATUS_CODES['completed']]
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+EPOCH_WEEKDAY = 3  # le 1970-01-01 était un jeudi (lundi = 0)
+
+# Métriques additives accumulées pour chaque groupe
+METRICS = ('appointments', 'revenue', 'minutes', 'no_shows', 'attended')
+
+def fetch_column_batches(session, model, conditions: List, chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+    """Lit les colonnes des rendez-vous par lots et les retourne sous forme de tableaux NumPy"""
+    table = model.__table__
+    statement = select(
+        table.c.prothesiste_id,
+        table.c.service_id,
+        # Chaîne ISO (SQLite) ou date (MySQL) : convertie directement par NumPy
+        type_coerce(table.c.appointment_date, String),
+        extract('hour', table.c.appointment_time),
+        table.c.duration,
+        table.c.price,
+        type_coerce(table.c.status, String)
+    ).where(*conditions)
+
+    # Exécution Core sur la connexion de la session (shard compris), sans construction d'objets ORM
+    connection = session.connection(bind_arguments={'clause': statement})
+    result = connection.execute(statement, execution_options={'yield_per': chunk_size})
+
+    for rows in result.partitions():
+        prothesiste_ids, service_ids, dates, hours, durations, prices, statuses = zip(*rows)
+        labels, codes = np.unique(np.array(statuses, dtype=str), return_inverse=True)
+        label_codes = np.array([STATUS_CODES.get(label, STATUS_CODES['confirmed']) for label in labels], dtype=np.int8)
+        yield {
+            'prothesiste_id': np.array(prothesiste_ids, dtype=np.int64),
+            'service_id': np.array(service_ids, dtype=np.int64),
+            # Jours depuis le 1970-01-01
+            'day': np.array(dates, dtype='datetime64[D]').astype(np.int64),
+            'hour': np.array(hours, dtype=np.int64),
+            # None devient NaN, compté comme 0
+            'duration': np.nan_to_num(np.array(durations, dtype=np.float64)),
+            'price': np.nan_to_num(np.array(prices, dtype=np.float64)),
+            'status': label_codes[codes.ravel()]
+        }
+
+def grouped_sums(codes: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    """Somme de chaque métrique (lignes de weights) par code de groupe, shape (métriques, size)"""
+    return np.stack([np.bincount(codes, weights=row, minlength=size) for row in weights])
+
+class ActivityAggregator:
+    """Accumule les métriques par service, prothésiste, jour de la semaine et heure"""
+
+    def __init__(self, today: date):
+        self.today = np.datetime64(today, 'D').astype(np.int64)
+        self.totals = np.zeros(len(METRICS))
+        self.by_weekday = np.zeros((len(METRICS), 7))
+        self.by_hour = np.zeros((len(METRICS), 24))
+        self.by_service: Dict[int, np.ndarray] = {}
+        self.by_prothesiste: Dict[int, np.ndarray] = {}
+
+    def add(self, batch: Dict[str, np.ndarray]):
+        status = batch['status']
+        earning = np.isin(status, REVENUE_CODES)
+        no_show = status == NO_SHOW
+        past = batch['day'] < self.today
+
+        # Une ligne par métrique, une colonne par rendez-vous
+        weights = np.stack([
+            status != CANCELLED,
+            np.where(earning, batch['price'], 0.0),
+            np.where(earning, batch['duration'], 0.0),
+            no_show & past,
+            (earning | no_show) & past
+        ]).astype(np.float64)
+
+        self.totals += weights.sum(axis=1)
+        self.by_weekday += grouped_sums((batch['day'] + EPOCH_WEEKDAY) % 7, weights, 7)
+        self.by_hour += grouped_sums(batch['hour'], weights, 24)
+
+        for key, groups in (('service_id', self.by_service), ('prothesiste_id', self.by_prothesiste)):
+            ids, codes = np.unique(batch[key], return_inverse=True)
+            sums = grouped_sums(codes.ravel(), weights, len(ids))
+            for group_id, column in zip(ids.tolist(), sums.T):
+                groups[group_id] = groups[group_id] + column if group_id in groups else column
+
+    @staticmethod
+    def summary(values: np.ndarray) -> Dict:
+        metrics = dict(zip(METRICS, values.tolist()))
+        return {
+            'appointments': int(metrics['appointments']),
+            'revenue': round(metrics['revenue'], 2),
+            'minutes': int(metrics['minutes']),
+            'no_show_rate': round(metrics['no_shows'] / metrics['attended'], 4) if metrics['attended'] else None
+        }
+
+    def result(self) -> Dict:
+        def by_id(groups, name):
+            rows = [{name: group_id, **self.summary(values)} for group_id, values in groups.items()]
+            return sorted(rows, key=lambda row: -row['revenue'])
+
+        return {
+            'totals': self.summary(self.totals),
+            'by_service': by_id(self.by_service, 'service_id'),
+            'by_prothesiste': by_id(self.by_prothesiste, 'prothesiste_id'),
+            'by_weekday': [
+                {'day_of_week': day, **self.summary(self.by_weekday[:, index])}
+                for index, day in enumerate(WEEKDAYS)
+            ],
+            'by_hour': [
+                {'hour': hour, **self.summary(self.by_hour[:, hour])}
+                for hour in range(24) if self.by_hour[:, hour].any()
+            ]
+        }
@@ -0,0 +1,75 @@
+# archive_appointments.py - Déplace les rendez-vous anciens vers appointments_archive
+#
+# Usage : python archive_appointments.py [--horizon-days N] [--batch-size N] [--max-batches N]
+#
+# Chaque lot est copié puis supprimé dans la même transaction : le script peut être
+# interrompu et relancé à tout moment, il reprend là où il s'était arrêté.
+# Les lectures ne consultent l'archive qu'avant l'horizon ARCHIVE_HORIZON_DAYS : l'horizon
+# du script ne peut donc pas être plus court que celui de l'application, et celui de
+# l'application ne doit jamais être augmenté après un archivage (voir la configuration).
+# Les rendez-vous ayant un avis restent dans la table courante (reviews.appointment_id
+# référence appointments avec ON DELETE CASCADE). Avec le sharding, la base principale puis
+# chaque shard sont archivés à leur tour.
+import argparse
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import text
+from app import app, db, Appointment, booking_binds, shard_context
+
+DEFAULT_BATCH_SIZE = 5000
+
+COLUMNS = ', '.join(column.name for column in Appointment.__table__.columns)
+
+def archive_batch(cutoff: date, batch_size: int) -> int:
+    """Archive un lot de rendez-vous antérieurs à cutoff, retourne le nombre déplacé"""
+    ids = db.session.execute(text(
+        'SELECT a.id FROM appointments a '
+        'WHERE a.appointment_date < :cutoff '
+        'AND NOT EXISTS (SELECT 1 FROM reviews r WHERE r.appointment_id = a.id) '
+        'ORDER BY a.appointment_date, a.id LIMIT :limit'
+    ), {'cutoff': cutoff, 'limit': batch_size}).scalars().all()
+    if not ids:
+        return 0
+
+    params = {f'id_{i}': appointment_id for i, appointment_id in enumerate(ids)}
+    placeholders = ', '.join(f':{name}' for name in params)
+    db.session.execute(text(
+        f'INSERT INTO appointments_archive ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM appointments WHERE id IN ({placeholders})'
+    ), params)
+    db.session.execute(text(f'DELETE FROM appointments WHERE id IN ({placeholders})'), params)
+    db.session.commit()
+    return len(ids)
+
+def archive_appointments(horizon_days: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                         max_batches: Optional[int] = None) -> int:
+    """Archive par lots les rendez-vous plus anciens que l'horizon"""
+    if horizon_days is None:
+        horizon_days = app.config['ARCHIVE_HORIZON_DAYS']
+    if horizon_days < app.config['ARCHIVE_HORIZON_DAYS']:
+        raise ValueError(f"L'horizon ne peut pas être inférieur à ARCHIVE_HORIZON_DAYS ({app.config['ARCHIVE_HORIZON_DAYS']} jours)")
+    cutoff = date.today() - timedelta(days=horizon_days)
+
+    total = 0
+    for shard_bind in booking_binds():
+        with shard_context(shard_bind):
+            batches = 0
+            while max_batches is None or batches < max_batches:
+                moved = archive_batch(cutoff, batch_size)
+                if not moved:
+                    break
+                total += moved
+                batches += 1
+                print(f'{total} rendez-vous archivés (avant le {cutoff.isoformat()})')
+
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Archivage des rendez-vous anciens')
+    parser.add_argument('--horizon-days', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-batches', type=int, default=None)
+    args = parser.parse_args()
+
+    with app.app_context():
+        archive_appointments(args.horizon_days, args.batch_size, args.max_batches)
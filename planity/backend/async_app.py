@@ -0,0 +1,117 @@
+# async_app.py - Chemin de lecture asynchrone (ASGI) pour les endpoints publics
+#
+# Lancement : uvicorn async_app:asgi_app --port 5001
+#
+# Sert GET /api/services et GET /api/prothesistes avec un moteur SQLAlchemy asynchrone
+# (aiomysql pour MySQL, aiosqlite pour SQLite) : une requête en attente de la base ne
+# bloque ni thread ni connexion. Une requête HTTP utilise au plus une connexion par base ;
+# ses lectures sur des bases différentes (shards) sont lancées en parallèle avec
+# asyncio.gather. Les écritures restent sur les handlers Flask d'app.py.
+import asyncio
+import json
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from app import (
+    app, Prothesiste, Service, prothesiste_listing_queries, serialize_prothesiste_listing, serialize_service
+)
+
+ASYNC_DRIVERS = {'mysql': 'mysql+aiomysql', 'sqlite': 'sqlite+aiosqlite'}
+
+def async_database_url(url: str) -> str:
+    """Remplace le driver synchrone de l'URL par son équivalent asynchrone"""
+    scheme, rest = url.split('://', 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+# Un moteur par base (principale + shards), comme les binds Flask-SQLAlchemy
+engines = {None: create_async_engine(async_database_url(app.config['SQLALCHEMY_DATABASE_URI']))}
+for shard_bind, url in app.config['SQLALCHEMY_BINDS'].items():
+    engines[shard_bind] = create_async_engine(async_database_url(url))
+sessions = {bind: async_sessionmaker(engine, expire_on_commit=False) for bind, engine in engines.items()}
+
+class RequestSessions:
+    """Sessions d'une requête HTTP : une par base, donc une connexion par base au plus
+    
+    Les lectures lancées ensemble sur une même base passent l'une après l'autre sur la même
+    connexion (une session n'est pas partageable entre tâches) ; seules les lectures sur des
+    bases différentes s'exécutent en parallèle.
+    """
+    
+    def __init__(self):
+        self.sessions: Dict[Optional[str], AsyncSession] = {}
+        self.locks: Dict[Optional[str], asyncio.Lock] = {}
+    
+    async def fetch_all(self, statement, bind: Optional[str] = None) -> List:
+        async with self.locks.setdefault(bind, asyncio.Lock()):
+            if bind not in self.sessions:
+                self.sessions[bind] = sessions[bind]()
+            return (await self.sessions[bind].execute(statement)).all()
+    
+    async def close(self):
+        for session in self.sessions.values():
+            await session.close()
+
+# Handlers
+async def get_services(reads: RequestSessions) -> List[Dict]:
+    """Récupère la liste des services actifs"""
+    rows = await reads.fetch_all(select(Service).filter_by(is_active=True))
+    return [serialize_service(service) for service, in rows]
+
+async def get_prothesistes(reads: RequestSessions) -> List[Dict]:
+    """Récupère la liste des prothésistes actives avec leurs services et leur disponibilité"""
+    prothesistes = [p for p, in await reads.fetch_all(
+        select(Prothesiste).filter_by(is_active=True, is_verified=True)
+    )]
+    if not prothesistes:
+        return []
+
+    # Mêmes requêtes que le handler Flask ; celles des shards partent en parallèle
+    services_query, availability_queries = prothesiste_listing_queries(prothesistes)
+    services, *availability = await asyncio.gather(
+        reads.fetch_all(services_query),
+        *(reads.fetch_all(query, shard_bind) for shard_bind, query in availability_queries.items())
+    )
+    available_today = {prothesiste_id for rows in availability for prothesiste_id, in rows}
+    return serialize_prothesiste_listing(prothesistes, services, available_today)
+
+ROUTES = {
+    '/api/services': get_services,
+    '/api/prothesistes': get_prothesistes,
+}
+
+# Application ASGI
+async def send_json(send, status: int, data, origin: Optional[bytes] = None):
+    headers = [(b'content-type', b'application/json')]
+    if origin:
+        # Même politique que flask_cors (supports_credentials=True)
+        headers += [(b'access-control-allow-origin', origin), (b'access-control-allow-credentials', b'true')]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': json.dumps(data, sort_keys=True).encode('utf-8')})
+
+async def asgi_app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for engine in engines.values():
+                    await engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    origin = dict(scope.get('headers', [])).get(b'origin')
+    handler = ROUTES.get(scope['path']) if scope['method'] == 'GET' else None
+    if not handler:
+        await send_json(send, 404, {'error': 'Endpoint non trouvé'}, origin)
+        return
+
+    reads = RequestSessions()
+    try:
+        try:
+            data = await handler(reads)
+        finally:
+            await reads.close()
+        await send_json(send, 200, data, origin)
+    except Exception as e:
+        await send_json(send, 500, {'error': str(e)}, origin)
@@ -0,0 +1,197 @@
+# audit_queries.py - Audit des plans d'exécution et suggestion d'index
+#
+# Usage : python audit_queries.py [--output migration.sql] <script> [arguments du script]
+# Exemple : python audit_queries.py --output ../BDD/migration_indexes.sql benchmarks/bench_archive.py 100000 20
+#
+# Le script (benchmark, scénario de test...) est exécuté tel quel ; chaque SELECT envoyé à la
+# base est capturé, puis passé à EXPLAIN sur la même base (SQLite ou MySQL). Les parcours
+# complets de table et les tris sans index (filesort) sont signalés, et un index composite est
+# proposé à partir des colonnes filtrées et triées : d'abord les égalités, puis la première
+# condition d'intervalle, puis l'ordre de tri.
+import argparse
+import os
+import re
+import runpy
+import sys
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, ColumnClause, UnaryExpression
+
+EQUALITY_OPERATORS = {operators.eq, operators.in_op, operators.is_}
+RANGE_OPERATORS = {operators.gt, operators.ge, operators.lt, operators.le, operators.between_op}
+MAX_INDEX_COLUMNS = 4
+
+PLACEHOLDERS_PATTERN = re.compile(r'\((?:\?|%s)(?:,\s*(?:\?|%s))+\)')
+
+class QueryCapture:
+    """Enregistre les SELECT distincts exécutés, avec un exemple de paramètres"""
+
+    def __init__(self):
+        self.queries: Dict[str, Dict] = {}
+
+    def __enter__(self):
+        event.listen(Engine, 'before_cursor_execute', self.capture)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self.capture)
+
+    def capture(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith('SELECT'):
+            return
+        # Les listes IN de longueurs différentes correspondent à la même requête
+        key = PLACEHOLDERS_PATTERN.sub('(...)', statement)
+        entry = self.queries.setdefault(key, {
+            'statement': statement,
+            'parameters': parameters,
+            'clause': context.compiled.statement if context.compiled is not None else None,
+            'count': 0
+        })
+        entry['count'] += 1
+
+def column_name(element) -> Optional[Tuple[str, str]]:
+    """(table, colonne) d'une expression de colonne, None sinon"""
+    if isinstance(element, UnaryExpression):
+        element = element.element
+    if isinstance(element, ColumnClause) and getattr(element, 'table', None) is not None:
+        table = getattr(element.table, 'name', None)
+        if table:
+            return table, element.name
+    return None
+
+def analyse_clause(clause) -> Dict[str, Dict[str, List[str]]]:
+    """Colonnes d'égalité, d'intervalle et de tri par table pour un SELECT"""
+    tables: Dict[str, Dict[str, List[str]]] = {}
+
+    def add(kind, element):
+        column = column_name(element)
+        if column:
+            columns = tables.setdefault(column[0], {'equality': [], 'range': [], 'order': []})[kind]
+            if column[1] not in columns:
+                columns.append(column[1])
+
+    where = getattr(clause, 'whereclause', None)
+    if where is not None:
+        for node in visitors.iterate(where):
+            if isinstance(node, BinaryExpression):
+                if node.operator in EQUALITY_OPERATORS:
+                    add('equality', node.left)
+                elif node.operator in RANGE_OPERATORS:
+                    add('range', node.left)
+
+    for element in getattr(clause, '_order_by_clauses', ()):
+        add('order', element)
+
+    return tables
+
+def explain(connection, statement: str, parameters) -> List[Tuple[str, str]]:
+    """Exécute EXPLAIN et retourne les problèmes détectés [(table, problème)]"""
+    issues = []
+    if connection.dialect.name == 'sqlite':
+        for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+            detail = row[-1]
+            if detail.startswith('SCAN '):
+                issues.append((detail.split()[1], 'parcours complet'))
+            elif 'TEMP B-TREE' in detail:
+                issues.append(('', 'tri sans index'))
+    else:
+        for row in connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings():
+            if row['type'] == 'ALL':
+                issues.append((row['table'], 'parcours complet'))
+            if row['Extra'] and 'filesort' in row['Extra']:
+                issues.append((row['table'], 'tri sans index'))
+    return issues
+
+def suggest_index(table: str, columns: Dict[str, List[str]], existing: List[List[str]]) -> Optional[List[str]]:
+    """Index composite couvrant le filtre et le tri, None si un index existant suffit"""
+    suggestion = list(columns['equality'])
+    if columns['range']:
+        suggestion.append(columns['range'][0])
+    suggestion += [c for c in columns['order'] if c not in suggestion]
+    suggestion = suggestion[:MAX_INDEX_COLUMNS]
+
+    if not suggestion:
+        return None
+    if any(index[:len(suggestion)] == suggestion for index in existing):
+        return None
+    return suggestion
+
+def audit(queries: Dict[str, Dict], engine) -> Tuple[List[Dict], Dict[str, List[str]]]:
+    """EXPLAIN de chaque requête capturée, retourne le rapport et les index proposés"""
+    inspector = inspect(engine)
+    existing_indexes: Dict[str, List[List[str]]] = {}
+    report = []
+    suggestions: Dict[str, List[str]] = {}
+
+    with engine.connect() as connection:
+        for query in sorted(queries.values(), key=lambda q: -q['count']):
+            issues = explain(connection, query['statement'], query['parameters'])
+            if not issues:
+                continue
+
+            columns_by_table = analyse_clause(query['clause'])
+            for table, _ in issues:
+                # SQLite ne nomme pas la table pour les tris temporaires
+                for name in ([table] if table else columns_by_table):
+                    if name not in columns_by_table or not inspector.has_table(name):
+                        continue
+                    if name not in existing_indexes:
+                        existing_indexes[name] = [
+                            index['column_names'] for index in inspector.get_indexes(name)
+                        ] + [
+                            constraint['column_names'] for constraint in inspector.get_unique_constraints(name)
+                        ] + [inspector.get_pk_constraint(name)['constrained_columns']]
+
+                    index = suggest_index(name, columns_by_table[name], existing_indexes[name])
+                    if index:
+                        index_name = f"idx_{name}_{'_'.join(index)}"[:64]
+                        suggestions[index_name] = [name] + index
+                        existing_indexes[name].append(index)
+
+            report.append({'count': query['count'], 'issues': issues, 'statement': query['statement']})
+
+    return report, suggestions
+
+def write_migration(suggestions: Dict[str, List[str]], path: str):
+    """Écrit la migration SQL des index proposés"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'-- Index proposés par audit_queries.py le {date.today().isoformat()}\n')
+        for index_name, (table, *columns) in sorted(suggestions.items()):
+            f.write(f"CREATE INDEX {index_name} ON {table}({', '.join(columns)});\n")
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit des plans d\'exécution des requêtes')
+    parser.add_argument('--output', help='fichier de migration SQL à générer')
+    parser.add_argument('script', help='script à exécuter (benchmark, scénario de test)')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    with QueryCapture() as capture:
+        runpy.run_path(args.script, run_name='__main__')
+
+    # L'application est importée par le script, avec la base qu'il a choisie
+    from app import app, db
+
+    with app.app_context():
+        report, suggestions = audit(capture.queries, db.engine)
+
+    print(f'\n{len(capture.queries)} requêtes distinctes, {len(report)} avec un plan à revoir')
+    for entry in report:
+        issues = ', '.join(f'{issue} {table}'.strip() for table, issue in entry['issues'])
+        print(f"\n[{entry['count']}x] {issues}\n  {' '.join(entry['statement'].split())[:300]}")
+
+    if suggestions:
+        print('\nIndex proposés :')
+        for index_name, (table, *columns) in sorted(suggestions.items()):
+            print(f"  {index_name} ON {table}({', '.join(columns)})")
+        if args.output:
+            write_migration(suggestions, args.output)
+            print(f'Migration écrite dans {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# bench_analytics.py - Statistiques d'activité : objets ORM vs lots de colonnes NumPy
+#
+# Usage : python benchmarks/bench_analytics.py [rendez-vous] [--skip-orm]
+# Par défaut 5 000 000 de rendez-vous répartis sur la dernière année.
+import random
+import sys
+import time as timer
+from datetime import date, time, timedelta
+
+from common import app, db, seed_catalog
+from sqlalchemy import insert
+from app import Appointment, get_activity_analytics, _analytics_cache
+
+INSERT_BATCH = 10000
+SLOTS_PER_DAY = 12
+WEIGHTED_STATUSES = ['completed'] * 6 + ['confirmed'] * 2 + ['cancelled', 'no_show']
+
+def seed_year(prothesiste_ids, service_ids, count):
+    """Insère count rendez-vous sur les 365 derniers jours, un par créneau et par prothésiste"""
+    today = date.today()
+    rows = []
+    for i in range(count):
+        slot = i // len(prothesiste_ids)
+        rows.append({
+            'client_id': None,
+            'prothesiste_id': prothesiste_ids[i % len(prothesiste_ids)],
+            'service_id': random.choice(service_ids),
+            'appointment_date': today - timedelta(days=1 + (slot // SLOTS_PER_DAY) % 365),
+            'appointment_time': time(8 + slot % SLOTS_PER_DAY),
+            'duration': random.choice([30, 45, 60, 90]),
+            'price': random.choice([25.0, 35.0, 45.0, 60.0]),
+            'status': random.choice(WEIGHTED_STATUSES),
+            'notes': ''
+        })
+        if len(rows) == INSERT_BATCH:
+            db.session.execute(insert(Appointment), rows)
+            db.session.commit()
+            rows = []
+    if rows:
+        db.session.execute(insert(Appointment), rows)
+        db.session.commit()
+
+def orm_revenue_by_service(date_from, date_to):
+    """Référence : parcours des objets Appointment et agrégation en Python"""
+    revenue = {}
+    query = Appointment.query.filter(
+        Appointment.appointment_date >= date_from, Appointment.appointment_date <= date_to
+    ).yield_per(10000)
+    for appointment in query:
+        if appointment.status in ('confirmed', 'completed'):
+            revenue[appointment.service_id] = revenue.get(appointment.service_id, 0.0) + (appointment.price or 0.0)
+    return {service_id: round(total, 2) for service_id, total in revenue.items()}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 5_000_000
+    skip_orm = '--skip-orm' in sys.argv
+    prothesistes = max(1, count // (SLOTS_PER_DAY * 365) + 1)
+
+    with app.app_context():
+        prothesiste_ids, service_ids = seed_catalog(prothesistes=prothesistes, services=8)
+        start = timer.perf_counter()
+        seed_year(prothesiste_ids, service_ids, count)
+        print(f'{count} rendez-vous insérés en {timer.perf_counter() - start:.1f} s ({prothesistes} prothésistes)')
+
+        date_to = date.today()
+        date_from = date_to - timedelta(days=365)
+
+        start = timer.perf_counter()
+        analytics = get_activity_analytics(date_from, date_to)
+        vectorized = timer.perf_counter() - start
+
+        start = timer.perf_counter()
+        assert get_activity_analytics(date_from, date_to) is analytics
+        cached = timer.perf_counter() - start
+        _analytics_cache.clear()
+
+        print(f"{'chemin':<26}{'secondes':>10}")
+        if not skip_orm:
+            start = timer.perf_counter()
+            reference = orm_revenue_by_service(date_from, date_to)
+            print(f"{'objets ORM (CA/service)':<26}{timer.perf_counter() - start:>10.2f}")
+            by_service = {row['service_id']: row['revenue'] for row in analytics['by_service']}
+            assert all(abs(by_service[k] - v) < 0.01 for k, v in reference.items()), 'résultats différents'
+        print(f"{'colonnes NumPy (tout)':<26}{vectorized:>10.2f}")
+        print(f"{'cache de période':<26}{cached:>10.6f}")
+
+        totals = analytics['totals']
+        print(f"\n{totals['appointments']} rendez-vous, CA {totals['revenue']:.2f} €, "
+              f"taux d'absence {totals['no_show_rate']:.2%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# bench_archive.py - Latence des lectures courantes avant/après archivage de l'historique
+#
+# Usage : python benchmarks/bench_archive.py [rendez-vous historiques] [répétitions]
+# Par défaut 5 000 000 de rendez-vous répartis sur les 5 dernières années.
+import random
+import sys
+import time as timer
+from datetime import date, time, timedelta
+
+from common import app, db, seed_catalog
+from sqlalchemy import insert
+from app import Appointment, create_jwt_token
+from archive_appointments import archive_appointments
+
+INSERT_BATCH = 10000
+STATUSES = ['completed', 'completed', 'completed', 'cancelled', 'no_show']
+
+def seed_history(prothesiste_ids, service_ids, count):
+    """Insère l'historique par lots, un seul créneau par (prothésiste, date, heure)"""
+    today = date.today()
+    slots_per_day = 12
+    rows = []
+    for i in range(count):
+        prothesiste_id = prothesiste_ids[i % len(prothesiste_ids)]
+        slot = i // len(prothesiste_ids)
+        rows.append({
+            'client_id': None,
+            'prothesiste_id': prothesiste_id,
+            'service_id': random.choice(service_ids),
+            'appointment_date': today - timedelta(days=1 + slot // slots_per_day),
+            'appointment_time': time(8 + slot % slots_per_day),
+            'duration': 60,
+            'price': 35.0,
+            'status': random.choice(STATUSES),
+            'notes': ''
+        })
+        if len(rows) == INSERT_BATCH:
+            db.session.execute(insert(Appointment), rows)
+            db.session.commit()
+            rows = []
+    if rows:
+        db.session.execute(insert(Appointment), rows)
+        db.session.commit()
+
+def measure(client, token, prothesiste_id, service_id, repeats):
+    """Mesure les lectures de la période courante et la vérification de créneau"""
+    today = date.today().isoformat()
+    headers = {'Authorization': f'Bearer {token}'}
+    timings = {}
+
+    start = timer.perf_counter()
+    for _ in range(repeats):
+        assert client.get(f'/api/prothesiste/appointments?from={today}', headers=headers).status_code == 200
+    timings['agenda prothésiste'] = (timer.perf_counter() - start) / repeats
+
+    start = timer.perf_counter()
+    for _ in range(repeats):
+        assert client.get(f'/api/appointments?from={today}').status_code == 200
+    timings['liste à venir'] = (timer.perf_counter() - start) / repeats
+
+    start = timer.perf_counter()
+    for _ in range(repeats):
+        response = client.post('/api/appointments', json={
+            'prothesisteId': prothesiste_id, 'serviceId': service_id,
+            'date': (date.today() + timedelta(days=1)).isoformat(), 'time': '09:00',
+            'name': 'Bench', 'phone': '0612345678'
+        })
+        assert response.status_code in (201, 409)
+    timings['contrôle de créneau'] = (timer.perf_counter() - start) / repeats
+
+    return timings
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    # Tout l'historique (antérieur à aujourd'hui) est archivable
+    app.config['ARCHIVE_HORIZON_DAYS'] = 0
+
+    with app.app_context():
+        prothesiste_ids, service_ids = seed_catalog(prothesistes=200)
+        start = timer.perf_counter()
+        seed_history(prothesiste_ids, service_ids, count)
+        print(f'{count} rendez-vous insérés en {timer.perf_counter() - start:.1f} s')
+        token = create_jwt_token(prothesiste_ids[0], 'prothesiste')
+
+    client = app.test_client()
+    before = measure(client, token, prothesiste_ids[0], service_ids[0], repeats)
+
+    with app.app_context():
+        start = timer.perf_counter()
+        archived = archive_appointments(batch_size=50000)
+        print(f'{archived} rendez-vous archivés en {timer.perf_counter() - start:.1f} s')
+
+    after = measure(client, token, prothesiste_ids[0], service_ids[0], repeats)
+
+    print(f'{"lecture":<22}{"avant":>12}{"après":>12}')
+    for name in before:
+        print(f'{name:<22}{before[name] * 1000:>10.2f}ms{after[name] * 1000:>10.2f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# bench_async_reads.py - Lectures publiques : handlers Flask synchrones vs chemin ASGI asynchrone
+#
+# Usage : python benchmarks/bench_async_reads.py [requêtes simultanées] [requêtes au total]
+#
+# Pour chaque chemin : débit, nombre de threads et de connexions ouvertes au pic, et mémoire
+# Python allouée au pic rapportée au nombre de requêtes simultanées (tracemalloc).
+import asyncio
+import json
+import os
+import sys
+import threading
+import time as timer
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+TOTAL = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+# Le chemin synchrone doit disposer d'une connexion par thread
+os.environ.setdefault('DB_POOL_SIZE', str(CONCURRENCY))
+
+from common import app, db, seed_catalog  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from async_app import asgi_app, engines  # noqa: E402
+
+PATHS = ['/api/services', '/api/prothesistes']
+
+class ConnectionCounter:
+    """Compte les connexions empruntées au pool, et leur maximum simultané"""
+
+    def __init__(self, pool):
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        event.listen(pool, 'checkout', self.checkout)
+        event.listen(pool, 'checkin', self.checkin)
+
+    def checkout(self, *args):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def checkin(self, *args):
+        with self.lock:
+            self.current -= 1
+
+def run_sync(concurrency, total):
+    client = app.test_client()
+    with app.app_context():
+        counter = ConnectionCounter(db.engine.pool)
+    peak_threads = []
+
+    def call(i):
+        peak_threads.append(threading.active_count())
+        response = client.get(PATHS[i % len(PATHS)])
+        assert response.status_code == 200, response.json
+        return response.get_data()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        bodies = list(executor.map(call, range(total)))
+    return bodies, counter.peak, max(peak_threads)
+
+async def call_asgi(path):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app({'type': 'http', 'method': 'GET', 'path': path, 'headers': []}, receive, send)
+    assert messages[0]['status'] == 200
+    return messages[1]['body']
+
+async def run_async_batches(concurrency, total):
+    counter = ConnectionCounter(engines[None].sync_engine.pool)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i):
+        async with semaphore:
+            return await call_asgi(PATHS[i % len(PATHS)])
+
+    bodies = await asyncio.gather(*(call(i) for i in range(total)))
+    for engine in engines.values():
+        await engine.dispose()
+    return bodies, counter.peak, threading.active_count()
+
+def measure(run):
+    tracemalloc.start()
+    start = timer.perf_counter()
+    bodies, connections, threads = run()
+    elapsed = timer.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return bodies, elapsed, connections, threads, peak
+
+def main():
+    concurrency, total = CONCURRENCY, TOTAL
+
+    with app.app_context():
+        seed_catalog(prothesistes=50, services=8)
+
+    results = {
+        'sync (Flask)': measure(lambda: run_sync(concurrency, total)),
+        'async (ASGI)': measure(lambda: asyncio.run(run_async_batches(concurrency, total))),
+    }
+
+    sync_bodies, async_bodies = results['sync (Flask)'][0], results['async (ASGI)'][0]
+    assert [json.loads(b) for b in sync_bodies] == [json.loads(b) for b in async_bodies], 'réponses différentes'
+
+    print(f'{total} requêtes, {concurrency} simultanées')
+    print(f'{"chemin":<14}{"req/s":>9}{"threads":>9}{"connexions":>12}{"Ko/requête":>12}')
+    for name, (_, elapsed, connections, threads, peak) in results.items():
+        print(f'{name:<14}{total / elapsed:>9.0f}{threads:>9}{connections:>12}{peak / 1024 / concurrency:>12.1f}')
+
+if __name__ == '__main__':
+    main()
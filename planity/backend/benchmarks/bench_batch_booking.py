@@ -0,0 +1,58 @@
+# bench_batch_booking.py - Réservation récurrente : N appels unitaires vs un appel groupé
+#
+# Usage : python benchmarks/bench_batch_booking.py [occurrences] [répétitions]
+# DATABASE_URL permet de viser une autre base que le SQLite temporaire par défaut.
+import sys
+import time as timer
+from datetime import date, timedelta
+
+from common import app, db, seed_catalog
+from app import Appointment
+
+def occurrences_for(run: int, count: int):
+    """Une occurrence toutes les deux semaines, sur un créneau propre à chaque répétition"""
+    start = date.today() + timedelta(days=1)
+    slot = f'{8 + run % 12:02d}:{(run // 12) % 2 * 30:02d}'
+    return [{'date': (start + timedelta(weeks=2 * i)).isoformat(), 'time': slot} for i in range(count)]
+
+def bench_single(client, prothesiste_id, service_id, occurrences):
+    for occurrence in occurrences:
+        response = client.post('/api/appointments', json={
+            'prothesisteId': prothesiste_id, 'serviceId': service_id,
+            'date': occurrence['date'], 'time': occurrence['time'],
+            'name': 'Bench', 'phone': '0612345678'
+        })
+        assert response.status_code == 201, response.json
+
+def bench_batch(client, prothesiste_id, service_id, occurrences):
+    response = client.post('/api/appointments/batch', json={
+        'prothesisteId': prothesiste_id, 'serviceId': service_id,
+        'occurrences': occurrences, 'name': 'Bench', 'phone': '0612345678'
+    })
+    assert response.status_code == 201 and not response.json['conflicts'], response.json
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 26
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with app.app_context():
+        (prothesiste_id,), (service_id, *_) = seed_catalog()
+    client = app.test_client()
+
+    results = {}
+    for name, bench in (('unitaire', bench_single), ('groupé', bench_batch)):
+        with app.app_context():
+            Appointment.query.delete()
+            db.session.commit()
+        start = timer.perf_counter()
+        for run in range(repeats):
+            bench(client, prothesiste_id, service_id, occurrences_for(run, count))
+        results[name] = (timer.perf_counter() - start) / repeats
+
+    print(f'{count} occurrences, {repeats} répétitions ({app.config["SQLALCHEMY_DATABASE_URI"].split(":")[0]})')
+    for name, elapsed in results.items():
+        print(f'  {name:<10} {elapsed * 1000:8.1f} ms par réservation récurrente')
+    print(f'  accélération x{results["unitaire"] / results["groupé"]:.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# check_shards.py - Vérification du sharding sur des fichiers SQLite locaux
+#
+# Usage : python benchmarks/check_shards.py
+#
+# Trois fichiers SQLite servent de shards, dont seuls les deux premiers sont en service au
+# départ. Le script vérifie que chaque rendez-vous est écrit sur le shard attribué à sa
+# prothésiste, qu'une prothésiste inscrite avant le sharding (shard NULL) reste sur la base
+# principale, que GET /api/appointments rassemble toutes les bases, puis qu'ajouter le
+# troisième shard ne déplace aucune prothésiste existante.
+import os
+import tempfile
+from datetime import date, timedelta
+
+# Les bases doivent être choisies avant l'import de l'application
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'main.db')}"
+os.environ['SHARD_DATABASE_URLS'] = ','.join(
+    f"sqlite:///{os.path.join(directory, f'shard_{index}.db')}" for index in range(3)
+)
+
+from common import app, db, seed_catalog  # noqa: E402
+from sqlalchemy import text, update  # noqa: E402
+from app import Prothesiste, booking_binds, create_shard_tables, create_jwt_token, shard_for, _shard_assignments  # noqa: E402
+
+def count_on_shard(shard_bind, prothesiste_id) -> int:
+    """Rendez-vous de la prothésiste présents physiquement dans le fichier du shard (None : base principale)"""
+    with db.engines[shard_bind].connect() as connection:
+        return connection.execute(
+            text('SELECT COUNT(*) FROM appointments WHERE prothesiste_id = :id'), {'id': prothesiste_id}
+        ).scalar()
+
+def book(client, prothesiste_id, service_id, day):
+    response = client.post('/api/appointments', json={
+        'prothesisteId': prothesiste_id, 'serviceId': service_id,
+        'date': (date.today() + timedelta(days=day)).isoformat(), 'time': '10:00',
+        'name': 'Cliente Test', 'phone': f'06123456{day:02d}'
+    })
+    assert response.status_code == 201, response.json
+
+def shards_of(prothesiste_ids):
+    """Attribution lue en base (cache vidé)"""
+    _shard_assignments.clear()
+    return {prothesiste_id: shard_for(prothesiste_id) for prothesiste_id in prothesiste_ids}
+
+def main():
+    all_shards = app.config['SHARD_BINDS']
+    app.config['SHARD_BINDS'] = all_shards[:2]
+    client = app.test_client()
+
+    with app.app_context():
+        prothesiste_ids, service_ids = seed_catalog(prothesistes=5, services=1)
+        create_shard_tables()
+
+        # Tourniquet : deux prothésistes par shard, sans doublon
+        placement = shards_of(prothesiste_ids[:4])
+        assert sorted(placement.values()) == ['shard_0', 'shard_0', 'shard_1', 'shard_1'], placement
+
+        # Inscrite avant l'activation du sharding : ses données restent dans la base principale
+        legacy_id = prothesiste_ids[4]
+        db.session.execute(update(Prothesiste).where(Prothesiste.id == legacy_id).values(shard=None))
+        db.session.commit()
+        placement.update(shards_of([legacy_id]))
+        assert placement[legacy_id] is None, placement
+
+        for day, prothesiste_id in enumerate(prothesiste_ids, start=1):
+            book(client, prothesiste_id, service_ids[0], day)
+
+        # Chaque rendez-vous est dans la base de sa prothésiste, et seulement là
+        for prothesiste_id, shard_bind in placement.items():
+            for other in booking_binds():
+                expected = 1 if other == shard_bind else 0
+                assert count_on_shard(other, prothesiste_id) == expected, (prothesiste_id, other)
+
+        # Scatter-gather : base principale et shards, triés par date
+        listing = client.get('/api/appointments').json
+        assert [apt['prothesiste']['id'] for apt in listing] == prothesiste_ids, listing
+
+        # Ajout d'un shard : les prothésistes existantes restent en place
+        app.config['SHARD_BINDS'] = all_shards
+        create_shard_tables()
+        assert shards_of(prothesiste_ids) == placement
+        for prothesiste_id in prothesiste_ids:
+            token = create_jwt_token(prothesiste_id, 'prothesiste')
+            agenda = client.get('/api/prothesiste/appointments', headers={'Authorization': f'Bearer {token}'}).json
+            assert len(agenda) == 1, (prothesiste_id, agenda)
+
+        # Le nouveau shard reçoit sa part des nouvelles prothésistes
+        newcomers = []
+        for index in range(3):
+            prothesiste = Prothesiste(
+                email=f'new{index}@nailsrdv.fr', password_hash='-', name=f'Nouvelle {index}',
+                specialite='Check', experience='1 an', is_verified=True
+            )
+            db.session.add(prothesiste)
+            db.session.commit()
+            newcomers.append(prothesiste.id)
+        assert set(shards_of(newcomers).values()) == set(all_shards), shards_of(newcomers)
+
+        print(f'Placement : {placement}')
+        print(f"{len(listing)} rendez-vous rassemblés depuis la base principale et {len(all_shards[:2])} shards, "
+              f"placement inchangé après ajout de {all_shards[2]}")
+
+if __name__ == '__main__':
+    main()
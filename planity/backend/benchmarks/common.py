@@ -0,0 +1,48 @@
+# common.py - Outils partagés par les benchmarks (base SQLite temporaire et données de test)
+import os
+import sys
+import tempfile
+from datetime import time
+
+# La base doit être choisie avant l'import de l'application
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import (  # noqa: E402
+    app, db, Prothesiste, Service, ProthesisteService, ProthesisteAvailability
+)
+
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+def seed_catalog(prothesistes: int = 1, services: int = 3):
+    """Crée des prothésistes disponibles tous les jours et leurs services"""
+    db.drop_all()
+    db.create_all()
+
+    service_ids = []
+    for i in range(services):
+        service = Service(code=f'service_{i}', name=f'Service {i}', icon='💅', duration=60, price=30.0 + i)
+        db.session.add(service)
+        db.session.flush()
+        service_ids.append(service.id)
+
+    prothesiste_ids = []
+    for i in range(prothesistes):
+        prothesiste = Prothesiste(
+            email=f'bench{i}@nailsrdv.fr', password_hash='-', name=f'Prothésiste {i}',
+            specialite='Bench', experience='1 an', is_verified=True
+        )
+        db.session.add(prothesiste)
+        db.session.flush()
+        prothesiste_ids.append(prothesiste.id)
+        for service_id in service_ids:
+            db.session.add(ProthesisteService(prothesiste_id=prothesiste.id, service_id=service_id))
+        for day in DAYS:
+            db.session.add(ProthesisteAvailability(
+                prothesiste_id=prothesiste.id, day_of_week=day, start_time=time(8), end_time=time(20)
+            ))
+
+    db.session.commit()
+    return prothesiste_ids, service_ids
@@ -0,0 +1,396 @@
+# import_salons.py - Import en masse (CSV ou JSON Lines) pour l'arrivée d'une chaîne de salons
+#
+# Usage : python import_salons.py <type> <fichier> [--chunk-size N] [--restart]
+#
+# Types et colonnes attendues :
+#   prothesistes : email, password (ou password_hash), name, specialite, experience,
+#                  photo, description, phone, address, is_verified
+#   services     : prothesiste_email, service_code, custom_price, custom_duration, is_available
+#   availability : prothesiste_email, day_of_week, start_time, end_time, is_available
+#   appointments : prothesiste_email, service_code, date, time, client_name, client_phone,
+#                  client_email, status, price, duration, notes
+#
+# Le fichier est lu en flux et écrit par lots (executemany) : la mémoire utilisée ne dépend
+# que de la taille des lots. Les lignes sont validées avec les règles de l'API ; les lignes
+# rejetées sont écrites dans <fichier>.rejects.jsonl avec leur numéro d'enregistrement
+# (champ record, à partir de 1 : les lignes vides d'un JSON Lines ne sont pas comptées et un
+# enregistrement CSV peut s'étendre sur plusieurs lignes). L'avancement est enregistré dans
+# import_checkpoints dans la transaction de chaque lot : une relance reprend après le
+# dernier lot validé. Avec le sharding, les lignes sont écrites sur le shard de leur
+# prothésiste (un lot réparti sur plusieurs shards n'est pas atomique entre shards).
+import argparse
+import csv
+import json
+import os
+from datetime import datetime, date
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
+from sqlalchemy import insert, select
+from app import (
+    app, db, bcrypt, Prothesiste, Service, ProthesisteService, ProthesisteAvailability,
+    Client, Appointment, AppointmentArchive, ImportCheckpoint,
+    validate_email, validate_phone, normalize_phone, shard_for, shard_context
+)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+DAYS_OF_WEEK = set(ProthesisteAvailability.__table__.c.day_of_week.type.enums)
+APPOINTMENT_STATUSES = set(Appointment.__table__.c.status.type.enums)
+
+class RowError(ValueError):
+    """Ligne invalide, rejetée sans interrompre l'import"""
+
+# Lecture et conversion des valeurs
+def read_records(path: str) -> Iterator:
+    """Lit le fichier ligne à ligne (CSV ou JSON Lines)"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            for record in csv.DictReader(f):
+                yield {key: value.strip() if isinstance(value, str) else value for key, value in record.items()}
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield RowError('JSON invalide')
+                    continue
+                if not isinstance(record, dict):
+                    yield RowError('Objet JSON attendu')
+                    continue
+                # Mêmes valeurs que le chemin CSV : des chaînes (les booléens sont gardés)
+                yield {
+                    key: value if value is None or isinstance(value, bool) else str(value).strip()
+                    for key, value in record.items()
+                }
+
+def require(record: Dict, fields: List[str]):
+    for field in fields:
+        if not record.get(field):
+            raise RowError(f'Le champ {field} est obligatoire')
+
+def parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise RowError('Format de date invalide')
+
+def parse_time(value: str):
+    for fmt in ('%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except (TypeError, ValueError):
+            continue
+    raise RowError('Format d\'heure invalide')
+
+def parse_number(value, cast):
+    if value is None or value == '':
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise RowError(f'Valeur numérique invalide : {value}')
+
+def parse_bool(value, default: bool) -> bool:
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'oui', 'yes')
+
+class SalonImporter:
+    """Valide et écrit les lignes d'un type donné, avec les correspondances en mémoire"""
+
+    def __init__(self):
+        self.service_ids: Dict[str, int] = dict(db.session.execute(select(Service.code, Service.id)).all())
+        self.prothesiste_ids: Dict[str, int] = {
+            email.lower(): prothesiste_id
+            for email, prothesiste_id in db.session.execute(select(Prothesiste.email, Prothesiste.id)).all()
+        }
+        self.offers: Dict[Tuple[int, int], Tuple] = {}
+
+    def load_offers(self):
+        """Charge les prix/durées effectifs par (prothésiste, service) pour l'import des rendez-vous"""
+        services = {service.id: (service.price, service.duration) for service in Service.query.all()}
+        for ps in ProthesisteService.query.filter_by(is_available=True).all():
+            price, duration = services[ps.service_id]
+            self.offers[(ps.prothesiste_id, ps.service_id)] = (ps.custom_price or price, ps.custom_duration or duration)
+
+    def prothesiste_id(self, record: Dict) -> int:
+        require(record, ['prothesiste_email'])
+        prothesiste_id = self.prothesiste_ids.get(record['prothesiste_email'].lower())
+        if not prothesiste_id:
+            raise RowError('Prothésiste non trouvée')
+        return prothesiste_id
+
+    def service_id(self, record: Dict) -> int:
+        require(record, ['service_code'])
+        service_id = self.service_ids.get(record['service_code'])
+        if not service_id:
+            raise RowError('Service non trouvé')
+        return service_id
+
+    # Validation ligne à ligne (mêmes règles que les endpoints de l'API)
+    def prepare_prothesistes(self, record: Dict) -> Dict:
+        require(record, ['email', 'name', 'specialite', 'experience'])
+        if not validate_email(record['email']):
+            raise RowError('Format d\'email invalide')
+        if record.get('phone') and not validate_phone(record['phone']):
+            raise RowError('Format de téléphone invalide')
+
+        if record.get('password_hash'):
+            password_hash = record['password_hash']
+        elif record.get('password') and len(record['password']) >= 6:
+            password_hash = bcrypt.generate_password_hash(record['password']).decode('utf-8')
+        else:
+            raise RowError('Le mot de passe doit contenir au moins 6 caractères')
+
+        return {
+            'email': record['email'].lower(),
+            'password_hash': password_hash,
+            'name': record['name'],
+            'specialite': record['specialite'],
+            'experience': record['experience'],
+            'photo': record.get('photo') or '👩‍🎨',
+            'description': record.get('description') or '',
+            'phone': record.get('phone') or None,
+            'address': record.get('address') or '',
+            'is_verified': parse_bool(record.get('is_verified'), False)
+        }
+
+    def prepare_services(self, record: Dict) -> Dict:
+        return {
+            'prothesiste_id': self.prothesiste_id(record),
+            'service_id': self.service_id(record),
+            'custom_price': parse_number(record.get('custom_price'), float),
+            'custom_duration': parse_number(record.get('custom_duration'), int),
+            'is_available': parse_bool(record.get('is_available'), True)
+        }
+
+    def prepare_availability(self, record: Dict) -> Dict:
+        require(record, ['day_of_week', 'start_time', 'end_time'])
+        day_of_week = record['day_of_week'].lower()
+        if day_of_week not in DAYS_OF_WEEK:
+            raise RowError(f'Jour invalide : {record["day_of_week"]}')
+        start_time, end_time = parse_time(record['start_time']), parse_time(record['end_time'])
+        if start_time >= end_time:
+            raise RowError('L\'heure de fin doit être après l\'heure de début')
+        return {
+            'prothesiste_id': self.prothesiste_id(record),
+            'day_of_week': day_of_week,
+            'start_time': start_time,
+            'end_time': end_time,
+            'is_available': parse_bool(record.get('is_available'), True)
+        }
+
+    def prepare_appointments(self, record: Dict) -> Dict:
+        require(record, ['date', 'time', 'client_name', 'client_phone'])
+        prothesiste_id = self.prothesiste_id(record)
+        service_id = self.service_id(record)
+
+        offer = self.offers.get((prothesiste_id, service_id))
+        if not offer:
+            raise RowError('Ce service n\'est pas disponible pour cette prothésiste')
+
+        phone_normalized = normalize_phone(record['client_phone'])
+        if not phone_normalized:
+            raise RowError('Format de téléphone invalide')
+        if record.get('client_email') and not validate_email(record['client_email']):
+            raise RowError('Format d\'email invalide')
+
+        appointment_date = parse_date(record['date'])
+        status = record.get('status') or ('completed' if appointment_date < date.today() else 'confirmed')
+        if status not in APPOINTMENT_STATUSES:
+            raise RowError(f'Statut invalide : {status}')
+
+        price = parse_number(record.get('price'), float)
+        duration = parse_number(record.get('duration'), int)
+        return {
+            'prothesiste_id': prothesiste_id,
+            'service_id': service_id,
+            'appointment_date': appointment_date,
+            'appointment_time': parse_time(record['time']),
+            'duration': duration or offer[1],
+            'price': price if price is not None else offer[0],
+            'status': status,
+            'notes': record.get('notes') or '',
+            '_client': (phone_normalized, record['client_name'], record['client_phone'], record.get('client_email') or None)
+        }
+
+    # Écriture par lots (les doublons avec la base sont rejetés, comme dans l'API)
+    def write_prothesistes(self, rows: List[Tuple[int, Dict]]) -> List[Tuple[int, str]]:
+        emails = {row['email'] for _, row in rows}
+        taken = set(db.session.execute(select(Prothesiste.email).where(Prothesiste.email.in_(emails))).scalars())
+
+        rejects, values = [], []
+        for record_number, row in rows:
+            if row['email'] in taken:
+                rejects.append((record_number, 'Cet email est déjà utilisé'))
+                continue
+            taken.add(row['email'])
+            values.append(row)
+
+        if values:
+            db.session.execute(insert(Prothesiste), values)
+            self.prothesiste_ids.update(db.session.execute(
+                select(Prothesiste.email, Prothesiste.id).where(Prothesiste.email.in_([v['email'] for v in values]))
+            ).all())
+        return rejects
+
+    def write_unique_per_prothesiste(self, model, key: str, rows: List[Tuple[int, Dict]], error: str):
+        """Insère les lignes dont le couple (prothesiste_id, key) n'existe pas encore"""
+        prothesiste_ids = {row['prothesiste_id'] for _, row in rows}
+        taken = set(db.session.execute(
+            select(model.prothesiste_id, getattr(model, key)).where(model.prothesiste_id.in_(prothesiste_ids))
+        ).all())
+
+        rejects, values = [], []
+        for record_number, row in rows:
+            pair = (row['prothesiste_id'], row[key])
+            if pair in taken:
+                rejects.append((record_number, error))
+                continue
+            taken.add(pair)
+            values.append(row)
+
+        if values:
+            db.session.execute(insert(model), values)
+        return rejects
+
+    def write_services(self, rows):
+        return self.write_unique_per_prothesiste(
+            ProthesisteService, 'service_id', rows, 'Service déjà associé à cette prothésiste'
+        )
+
+    def write_availability(self, rows):
+        return self.write_unique_per_prothesiste(
+            ProthesisteAvailability, 'day_of_week', rows, 'Disponibilité déjà définie pour ce jour'
+        )
+
+    def resolve_clients(self, rows: List[Tuple[int, Dict]]) -> Dict[str, int]:
+        """Récupère ou crée en une passe les clients du lot (clé : téléphone normalisé)"""
+        clients = {row['_client'][0]: row['_client'] for _, row in rows}
+        client_ids = dict(db.session.execute(
+            select(Client.phone_normalized, Client.id).where(Client.phone_normalized.in_(clients))
+        ).all())
+
+        missing = [
+            {'phone_normalized': phone_normalized, 'name': name, 'phone': phone, 'email': email}
+            for phone_normalized, name, phone, email in clients.values()
+            if phone_normalized not in client_ids
+        ]
+        if missing:
+            db.session.execute(insert(Client), missing)
+            client_ids.update(db.session.execute(
+                select(Client.phone_normalized, Client.id).where(
+                    Client.phone_normalized.in_([m['phone_normalized'] for m in missing])
+                )
+            ).all())
+        return client_ids
+
+    def write_appointments(self, rows: List[Tuple[int, Dict]]) -> List[Tuple[int, str]]:
+        prothesiste_ids = {row['prothesiste_id'] for _, row in rows}
+        dates = {row['appointment_date'] for _, row in rows}
+        taken = set()
+        for model in (Appointment, AppointmentArchive):
+            taken.update(db.session.execute(
+                select(model.prothesiste_id, model.appointment_date, model.appointment_time).where(
+                    model.prothesiste_id.in_(prothesiste_ids),
+                    model.appointment_date.in_(dates)
+                )
+            ).all())
+
+        rejects, accepted = [], []
+        for record_number, row in rows:
+            slot = (row['prothesiste_id'], row['appointment_date'], row['appointment_time'])
+            if slot in taken:
+                rejects.append((record_number, 'Ce créneau est déjà réservé'))
+                continue
+            taken.add(slot)
+            accepted.append(row)
+
+        if accepted:
+            client_ids = self.resolve_clients([(None, row) for row in accepted])
+            values = []
+            for row in accepted:
+                values.append({
+                    **{key: value for key, value in row.items() if key != '_client'},
+                    'client_id': client_ids[row['_client'][0]]
+                })
+            db.session.execute(insert(Appointment), values)
+        return rejects
+
+def run_import(kind: str, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, restart: bool = False):
+    """Importe le fichier par lots, en reprenant après le dernier lot validé"""
+    importer = SalonImporter()
+    if kind == 'appointments':
+        importer.load_offers()
+    prepare = getattr(importer, f'prepare_{kind}')
+    write = getattr(importer, f'write_{kind}')
+
+    source = f'{kind}:{os.path.abspath(path)}'[:255]
+    checkpoint = ImportCheckpoint.query.get(source)
+    if checkpoint and restart:
+        db.session.delete(checkpoint)
+        db.session.commit()
+        checkpoint = None
+    if not checkpoint:
+        checkpoint = ImportCheckpoint(source=source, rows_done=0, rows_rejected=0)
+        db.session.add(checkpoint)
+        db.session.commit()
+    if checkpoint.rows_done:
+        print(f'Reprise après l\'enregistrement {checkpoint.rows_done}')
+
+    records = islice(read_records(path), checkpoint.rows_done, None)
+    record_number = checkpoint.rows_done
+    with open(f'{path}.rejects.jsonl', 'a', encoding='utf-8') as rejects_file:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+
+            rows, rejects = [], []
+            for record in chunk:
+                record_number += 1
+                try:
+                    if isinstance(record, RowError):
+                        raise record
+                    rows.append((record_number, prepare(record)))
+                except RowError as e:
+                    rejects.append((record_number, str(e)))
+
+            # Avec le sharding, chaque groupe de lignes est écrit sur le shard de sa prothésiste
+            shards: Dict = {}
+            for row in rows:
+                prothesiste_id = row[1].get('prothesiste_id')
+                shards.setdefault(shard_for(prothesiste_id) if prothesiste_id else None, []).append(row)
+
+            try:
+                for shard_bind, shard_rows in shards.items():
+                    with shard_context(shard_bind):
+                        rejects.extend(write(shard_rows))
+                checkpoint.rows_done = record_number
+                checkpoint.rows_rejected += len(rejects)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+            for reject_number, error in sorted(rejects):
+                rejects_file.write(json.dumps({'record': reject_number, 'error': error}, ensure_ascii=False) + '\n')
+            rejects_file.flush()
+            print(f'{record_number} enregistrements traités, {checkpoint.rows_rejected} rejetés')
+
+    return checkpoint.rows_done, checkpoint.rows_rejected
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import en masse des données salons')
+    parser.add_argument('kind', choices=['prothesistes', 'services', 'availability', 'appointments'])
+    parser.add_argument('path')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--restart', action='store_true', help='ignore le point de reprise existant')
+    args = parser.parse_args()
+
+    with app.app_context():
+        run_import(args.kind, args.path, args.chunk_size, args.restart)
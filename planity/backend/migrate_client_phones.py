@@ -0,0 +1,139 @@
+# migrate_client_phones.py - Normalisation des téléphones clients et fusion des doublons
+#
+# Usage : python migrate_client_phones.py [--dry-run]
+#
+# 1. ajoute la colonne clients.phone_normalized si elle n'existe pas
+# 2. calcule le numéro E.164 de chaque client, par lots
+# 3. fusionne les clients ayant le même numéro (le plus ancien est conservé)
+#    et rattache leurs rendez-vous (y compris archivés, sur chaque shard) et leur compte au
+#    client conservé ; deux clients liés à des comptes différents ne sont pas fusionnés mais
+#    signalés, le plus récent gardant un phone_normalized vide
+# 4. crée l'index unique unique_client_phone
+import sys
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import inspect, text
+from app import app, db, booking_binds, normalize_phone, shard_context
+
+BATCH_SIZE = 1000
+
+def add_phone_column():
+    """Ajoute la colonne phone_normalized si nécessaire"""
+    columns = {c['name'] for c in inspect(db.engine).get_columns('clients')}
+    if 'phone_normalized' not in columns:
+        db.session.execute(text('ALTER TABLE clients ADD COLUMN phone_normalized VARCHAR(16) NULL'))
+        db.session.commit()
+
+def scan_clients() -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Parcourt les clients par lots et sépare numéros à enregistrer, doublons et conflits de compte"""
+    canonical: Dict[str, int] = {}
+    canonical_users: Dict[int, Optional[int]] = {}
+    updates = []
+    duplicates = []
+    conflicts = []
+    last_id = 0
+
+    while True:
+        rows = db.session.execute(
+            text('SELECT id, phone, user_id FROM clients WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+
+        for client_id, phone, user_id in rows:
+            phone_normalized = normalize_phone(phone)
+            if not phone_normalized:
+                continue
+            if phone_normalized in canonical:
+                kept_id = canonical[phone_normalized]
+                kept_user_id = canonical_users[kept_id]
+                if user_id and kept_user_id and user_id != kept_user_id:
+                    conflicts.append({'client_id': kept_id, 'duplicate_id': client_id, 'phone': phone_normalized})
+                    continue
+                # Le compte du doublon passe au client conservé s'il n'en a pas
+                transferred_user_id = user_id if user_id and not kept_user_id else None
+                if transferred_user_id:
+                    canonical_users[kept_id] = transferred_user_id
+                duplicates.append({'duplicate_id': client_id, 'client_id': kept_id, 'user_id': transferred_user_id})
+            else:
+                canonical[phone_normalized] = client_id
+                canonical_users[client_id] = user_id
+                updates.append({'id': client_id, 'phone_normalized': phone_normalized})
+        last_id = rows[-1][0]
+
+    return updates, duplicates, conflicts
+
+def repoint_appointments(batch: List[Dict]):
+    """Rattache les rendez-vous des doublons au client conservé, dans chaque base de réservations"""
+    for shard_bind in booking_binds():
+        inspector = inspect(db.engines[shard_bind])
+        with shard_context(shard_bind):
+            for table in ('appointments', 'appointments_archive'):
+                if inspector.has_table(table):
+                    db.session.execute(
+                        text(f'UPDATE {table} SET client_id = :client_id WHERE client_id = :duplicate_id'),
+                        batch
+                    )
+            db.session.commit()
+
+def merge_duplicates(duplicates: List[Dict]):
+    """Rattache les rendez-vous des doublons au client conservé puis supprime les doublons"""
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        batch = duplicates[start:start + BATCH_SIZE]
+        # Les rendez-vous d'abord : une interruption laisse des doublons, jamais de client_id orphelin
+        repoint_appointments(batch)
+        # Compléter l'email du client conservé s'il manque
+        db.session.execute(text(
+            'UPDATE clients c JOIN clients d ON d.id = :duplicate_id '
+            'SET c.email = d.email WHERE c.id = :client_id AND c.email IS NULL'
+            if db.engine.dialect.name == 'mysql' else
+            'UPDATE clients SET email = (SELECT email FROM clients WHERE id = :duplicate_id) '
+            'WHERE id = :client_id AND email IS NULL'
+        ), batch)
+        db.session.execute(text('DELETE FROM clients WHERE id = :duplicate_id'), batch)
+        # Le compte est repris après la suppression du doublon (user_id est unique)
+        transfers = [duplicate for duplicate in batch if duplicate['user_id']]
+        if transfers:
+            db.session.execute(
+                text('UPDATE clients SET user_id = :user_id WHERE id = :client_id AND user_id IS NULL'),
+                transfers
+            )
+        db.session.commit()
+
+def backfill_phones(updates: List[Dict]):
+    """Enregistre les numéros normalisés par lots"""
+    for start in range(0, len(updates), BATCH_SIZE):
+        db.session.execute(
+            text('UPDATE clients SET phone_normalized = :phone_normalized WHERE id = :id'),
+            updates[start:start + BATCH_SIZE]
+        )
+        db.session.commit()
+
+def create_phone_index():
+    """Crée l'index unique sur le numéro normalisé"""
+    indexes = inspect(db.engine).get_indexes('clients')
+    indexes += inspect(db.engine).get_unique_constraints('clients')
+    if not any(index['name'] == 'unique_client_phone' for index in indexes):
+        db.session.execute(text('CREATE UNIQUE INDEX unique_client_phone ON clients (phone_normalized)'))
+        db.session.commit()
+
+def migrate(dry_run: bool = False):
+    """Exécute la migration complète"""
+    add_phone_column()
+    updates, duplicates, conflicts = scan_clients()
+    print(f'{len(updates)} clients à normaliser, {len(duplicates)} doublons à fusionner')
+    for conflict in conflicts:
+        print(f"Non fusionnés (comptes différents) : clients {conflict['client_id']} et "
+              f"{conflict['duplicate_id']}, numéro {conflict['phone']}")
+    if dry_run:
+        return
+
+    # Les doublons sont supprimés avant l'écriture des numéros pour respecter l'unicité
+    merge_duplicates(duplicates)
+    backfill_phones(updates)
+    create_phone_index()
+    print('Migration terminée')
+
+if __name__ == '__main__':
+    with app.app_context():
+        migrate(dry_run='--dry-run' in sys.argv)
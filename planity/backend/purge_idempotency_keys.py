@@ -0,0 +1,48 @@
+# purge_idempotency_keys.py - Supprime par lots les clés d'idempotence expirées
+#
+# Usage : python purge_idempotency_keys.py [--batch-size N] [--max-batches N]
+#
+# À planifier régulièrement (cron, toutes les heures par exemple). Une clé expirée (réponse
+# au-delà de IDEMPOTENCY_KEY_TTL, ou réservation abandonnée au-delà de son bail) ne peut plus
+# être rejouée ; chaque lot est supprimé dans sa propre transaction via idx_idempotency_expires.
+import argparse
+from datetime import datetime
+from typing import Optional
+from app import app, db, IdempotencyKey
+
+DEFAULT_BATCH_SIZE = 5000
+
+def purge_batch(now: datetime, batch_size: int) -> int:
+    """Supprime un lot de clés expirées, retourne le nombre supprimé"""
+    ids = [key_id for key_id, in IdempotencyKey.query.with_entities(IdempotencyKey.id).filter(
+        IdempotencyKey.expires_at < now
+    ).order_by(IdempotencyKey.expires_at).limit(batch_size).all()]
+    if not ids:
+        return 0
+
+    IdempotencyKey.query.filter(IdempotencyKey.id.in_(ids)).delete(synchronize_session=False)
+    db.session.commit()
+    return len(ids)
+
+def purge_expired_keys(batch_size: int = DEFAULT_BATCH_SIZE, max_batches: Optional[int] = None) -> int:
+    """Supprime par lots les clés d'idempotence expirées"""
+    now = datetime.utcnow()
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        deleted = purge_batch(now, batch_size)
+        if not deleted:
+            break
+        total += deleted
+        batches += 1
+        print(f'{total} clés d\'idempotence expirées supprimées')
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Purge des clés d\'idempotence expirées')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-batches', type=int, default=None)
+    args = parser.parse_args()
+
+    with app.app_context():
+        purge_expired_keys(args.batch_size, args.max_batches)
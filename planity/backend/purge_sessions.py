@@ -0,0 +1,48 @@
+# purge_sessions.py - Supprime par lots les sessions expirées de user_sessions
+#
+# Usage : python purge_sessions.py [--batch-size N] [--max-batches N]
+#
+# À planifier régulièrement (cron, toutes les heures par exemple). Chaque lot est supprimé
+# dans sa propre transaction : les verrous restent courts et le script peut être interrompu
+# puis relancé sans risque. Une session expirée n'a plus d'effet (le jeton l'est aussi).
+import argparse
+from datetime import datetime
+from typing import Optional
+from app import app, db, UserSession
+
+DEFAULT_BATCH_SIZE = 5000
+
+def purge_batch(now: datetime, batch_size: int) -> int:
+    """Supprime un lot de sessions expirées, retourne le nombre supprimé"""
+    ids = [session_id for session_id, in UserSession.query.with_entities(UserSession.id).filter(
+        UserSession.expires_at < now
+    ).order_by(UserSession.expires_at).limit(batch_size).all()]
+    if not ids:
+        return 0
+
+    UserSession.query.filter(UserSession.id.in_(ids)).delete(synchronize_session=False)
+    db.session.commit()
+    return len(ids)
+
+def purge_expired_sessions(batch_size: int = DEFAULT_BATCH_SIZE, max_batches: Optional[int] = None) -> int:
+    """Supprime par lots les sessions expirées"""
+    now = datetime.utcnow()
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        deleted = purge_batch(now, batch_size)
+        if not deleted:
+            break
+        total += deleted
+        batches += 1
+        print(f'{total} sessions expirées supprimées')
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Purge des sessions expirées')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-batches', type=int, default=None)
+    args = parser.parse_args()
+
+    with app.app_context():
+        purge_expired_sessions(args.batch_size, args.max_batches)
@@ -126,6 +126,14 @@ export const AuthProvider = ({ children }) => {
   };
 
   const logout = () => {
+    // Révocation de la session côté serveur (sans attendre la réponse)
+    if (token) {
+      fetch(`${API_BASE_URL}/auth/logout`, {
+        method: 'POST',
+        headers: { 'Authorization': `Bearer ${token}` }
+      }).catch(() => {});
+    }
+
     setUser(null);
     setProthesiste(null);
     setToken(null);
@@ -2,7 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from './AuthContext';
 
-const AvailabilityView = ({ availability, onSave }) => {
+const AvailabilityView = ({ availability, blockedSlots: loadedBlockedSlots, onSave }) => {
   const [availabilityData, setAvailabilityData] = useState({});
   const [blockedSlots, setBlockedSlots] = useState([]);
   const [showAddBlock, setShowAddBlock] = useState(false);
@@ -29,8 +29,13 @@ const AvailabilityView = ({ availability, onSave }) => {
 
   useEffect(() => {
     initializeAvailability();
-    fetchBlockedSlots();
-  }, [availability]);
+    // Créneaux déjà chargés par le tableau de bord (bootstrap) : pas de requête supplémentaire
+    if (loadedBlockedSlots) {
+      setBlockedSlots(loadedBlockedSlots);
+    } else {
+      fetchBlockedSlots();
+    }
+  }, [availability, loadedBlockedSlots]);
 
   const initializeAvailability = () => {
     const data = {};
@@ -49,6 +54,9 @@ const AvailabilityView = ({ availability, onSave }) => {
     setAvailabilityData(data);
   };
 
+  // Fournis par le tableau de bord : c'est lui qui recharge (bootstrap) après une modification
+  const refreshBlockedSlots = () => (loadedBlockedSlots ? onSave() : fetchBlockedSlots());
+
   const fetchBlockedSlots = async () => {
     try {
       const response = await fetch(`${API_BASE_URL}/prothesiste/blocked-slots`, {
@@ -136,7 +144,7 @@ const AvailabilityView = ({ availability, onSave }) => {
           reason: '',
           is_full_day: false
         });
-        fetchBlockedSlots();
+        refreshBlockedSlots();
         alert('✅ Créneau bloqué avec succès');
       } else {
         const data = await response.json();
@@ -157,7 +165,7 @@ const AvailabilityView = ({ availability, onSave }) => {
       });
 
       if (response.ok) {
-        fetchBlockedSlots();
+        refreshBlockedSlots();
         alert('✅ Blocage supprimé');
       }
     } catch (error) {
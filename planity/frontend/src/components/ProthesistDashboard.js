@@ -1,4 +1,5 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
+import AvailabilityView from './AvailabilityView';
 
 // Hook simulé pour l'authentification
 const useAuth = () => {
@@ -36,7 +37,11 @@ const ProthesisteDashboard = ({ onBack }) => {
   const [currentView, setCurrentView] = useState('overview');
   const [sidebarCollapsed, setSidebarCollapsed] = useState(false);
   const [data, setData] = useState({
+    profile: null,
     appointments: [],
+    services: [],
+    availability: [],
+    blockedSlots: [],
     stats: {
       todayAppointments: 0,
       weekRevenue: 0,
@@ -48,22 +53,50 @@ const ProthesisteDashboard = ({ onBack }) => {
 
   const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000/api';
 
+  // Profil à jour renvoyé par le bootstrap, celui de la connexion en attendant
+  const profile = data.profile || prothesiste;
+
+  // Versions des sections déjà chargées, renvoyées au rafraîchissement
+  const sectionVersions = useRef({});
+
   useEffect(() => {
     if (prothesiste) {
       fetchDashboardData();
+      // Rafraîchissement au retour sur l'onglet : seules les sections modifiées sont renvoyées
+      window.addEventListener('focus', fetchDashboardData);
+      return () => window.removeEventListener('focus', fetchDashboardData);
     }
   }, [prothesiste]);
 
   const fetchDashboardData = async () => {
     try {
-      // Récupération des rendez-vous
-      const appointmentsResponse = await fetch(`${API_BASE_URL}/prothesiste/appointments`, {
-        headers: getAuthHeaders()
-      });
+      // Chargement groupé : profil, services, disponibilités, rendez-vous et créneaux bloqués en un appel
+      const versions = Object.entries(sectionVersions.current)
+        .map(([section, version]) => `${section}:${version}`)
+        .join(',');
+      const bootstrapResponse = await fetch(
+        `${API_BASE_URL}/prothesiste/bootstrap${versions ? `?versions=${versions}` : ''}`,
+        { headers: getAuthHeaders() }
+      );
       
-      if (appointmentsResponse.ok) {
-        const appointments = await appointmentsResponse.json();
-        setData(prev => ({ ...prev, appointments }));
+      if (bootstrapResponse.ok) {
+        const sections = await bootstrapResponse.json();
+        const changed = {};
+        Object.entries(sections).forEach(([section, { version, data: sectionData, unchanged }]) => {
+          sectionVersions.current[section] = version;
+          if (!unchanged) {
+            changed[section] = sectionData;
+          }
+        });
+        
+        setData(prev => ({
+          ...prev,
+          ...(changed.profile && { profile: changed.profile }),
+          ...(changed.appointments && { appointments: changed.appointments }),
+          ...(changed.services && { services: changed.services }),
+          ...(changed.availability && { availability: changed.availability }),
+          ...(changed.blocked_slots && { blockedSlots: changed.blocked_slots })
+        }));
       }
 
       // Récupération des statistiques
@@ -78,7 +111,8 @@ const ProthesisteDashboard = ({ onBack }) => {
     } catch (error) {
       console.error('Erreur lors du chargement des données:', error);
       // Données de fallback pour la démonstration
-      setData({
+      setData(prev => ({
+        ...prev,
         appointments: [
           {
             id: 1,
@@ -122,7 +156,7 @@ const ProthesisteDashboard = ({ onBack }) => {
           averageRating: 4.8,
           nextAppointment: '10:00'
         }
-      });
+      }));
     }
   };
 
@@ -196,7 +230,7 @@ const ProthesisteDashboard = ({ onBack }) => {
                 alignItems: 'center',
                 gap: '12px'
               }}>
-                <div style={{ fontSize: '32px' }}>{prothesiste?.photo}</div>
+                <div style={{ fontSize: '32px' }}>{profile?.photo}</div>
                 <div>
                   <h2 style={{
                     fontWeight: '600',
@@ -206,7 +240,7 @@ const ProthesisteDashboard = ({ onBack }) => {
                     textOverflow: 'ellipsis',
                     whiteSpace: 'nowrap'
                   }}>
-                    {prothesiste?.name}
+                    {profile?.name}
                   </h2>
                   <p style={{
                     fontSize: '14px',
@@ -216,7 +250,7 @@ const ProthesisteDashboard = ({ onBack }) => {
                     textOverflow: 'ellipsis',
                     whiteSpace: 'nowrap'
                   }}>
-                    {prothesiste?.specialite}
+                    {profile?.specialite}
                   </p>
                 </div>
               </div>
@@ -450,7 +484,7 @@ const ProthesisteDashboard = ({ onBack }) => {
                 fontSize: '14px'
               }}>
                 <span style={{ color: '#fbbf24' }}>⭐</span>
-                <span style={{ fontWeight: '500' }}>{prothesiste?.rating}</span>
+                <span style={{ fontWeight: '500' }}>{profile?.rating}</span>
               </div>
             </div>
           </div>
@@ -464,10 +498,16 @@ const ProthesisteDashboard = ({ onBack }) => {
         }}>
           {currentView === 'overview' && <OverviewView data={data} />}
           {currentView === 'appointments' && <AppointmentsView appointments={data.appointments} />}
-          {currentView === 'availability' && <AvailabilityView />}
-          {currentView === 'services' && <ServicesView />}
+          {currentView === 'availability' && (
+            <AvailabilityView
+              availability={data.availability}
+              blockedSlots={data.blockedSlots}
+              onSave={fetchDashboardData}
+            />
+          )}
+          {currentView === 'services' && <ServicesView services={data.services} />}
           {currentView === 'clients' && <ClientsView />}
-          {currentView === 'profile' && <ProfileView prothesiste={prothesiste} />}
+          {currentView === 'profile' && <ProfileView prothesiste={profile} />}
         </main>
       </div>
     </div>
@@ -844,28 +884,7 @@ const AppointmentsView = ({ appointments }) => (
   </div>
 );
 
-const AvailabilityView = () => (
-  <div style={{
-    backgroundColor: 'white',
-    borderRadius: '12px',
-    boxShadow: '0 1px 3px 0 rgba(0, 0, 0, 0.1)',
-    border: '1px solid #e5e7eb',
-    padding: '24px'
-  }}>
-    <h2 style={{
-      fontSize: '20px',
-      fontWeight: '600',
-      margin: '0 0 16px 0'
-    }}>
-      Gestion des disponibilités
-    </h2>
-    <p style={{ color: '#6b7280' }}>
-      Interface de gestion des horaires et indisponibilités
-    </p>
-  </div>
-);
-
-const ServicesView = () => (
+const ServicesView = ({ services }) => (
   <div style={{
     backgroundColor: 'white',
     borderRadius: '12px',
@@ -880,9 +899,32 @@ const ServicesView = () => (
     }}>
       Mes services
     </h2>
-    <p style={{ color: '#6b7280' }}>
-      Gestion de votre catalogue de services
-    </p>
+    {services.length === 0 ? (
+      <p style={{ color: '#6b7280' }}>
+        Gestion de votre catalogue de services
+      </p>
+    ) : (
+      <div style={{ display: 'flex', flexDirection: 'column', gap: '12px' }}>
+        {services.map(service => (
+          <div key={service.id} style={{
+            display: 'flex',
+            alignItems: 'center',
+            justifyContent: 'space-between',
+            padding: '12px 16px',
+            border: '1px solid #e5e7eb',
+            borderRadius: '8px'
+          }}>
+            <div style={{ display: 'flex', alignItems: 'center', gap: '12px' }}>
+              <span style={{ fontSize: '24px' }}>{service.icon}</span>
+              <span style={{ fontWeight: '500', color: '#111827' }}>{service.name}</span>
+            </div>
+            <div style={{ fontSize: '14px', color: '#6b7280' }}>
+              {service.duration} min · <span style={{ fontWeight: '600', color: '#111827' }}>{service.price}€</span>
+            </div>
+          </div>
+        ))}
+      </div>
+    )}
   </div>
 );
 